@@ -1,27 +1,83 @@
+import math
 import numpy as np
 import matplotlib.pyplot as plt
-import pandas as pd
+
+# Try to import numba, but fall back to the NumPy implementation if not available
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # Time settings
 fs = 500  # Sampling frequency (Hz)
 duration = 10  # seconds to simulate
 t = np.linspace(0, duration, int(fs*duration))
 
+# P, Q, R, S and T wave parameters: offset from beat start (s), amplitude (mV), width (s)
+wave_offsets = np.array([0.1, 0.2, 0.22, 0.24, 0.35])
+wave_amps = np.array([0.25, -0.1, 1.0, -0.25, 0.5])
+wave_sigmas = np.array([0.01, 0.005, 0.01, 0.005, 0.02])
+wave_support = 4  # each wave is evaluated only within +/- this many sigmas of its center
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _synth(ecg, t, beat_starts, offsets, amps, sigmas, support):
+        """Compiled kernel: add every beat's windowed waves into ecg"""
+        n = len(t)
+        dt = t[1] - t[0]
+        lo = np.min(offsets - support * sigmas)
+        hi = np.max(offsets + support * sigmas)
+        span = int((hi - lo) / dt) + 2
+
+        # Each beat accumulates into a private buffer since neighbouring beats may overlap
+        parts = np.zeros((len(beat_starts), span))
+        first = np.empty(len(beat_starts), dtype=np.int64)
+        for b in prange(len(beat_starts)):
+            first[b] = max(0, int(np.ceil((beat_starts[b] + lo - t[0]) / dt)))
+            for w in range(len(offsets)):
+                center = beat_starts[b] + offsets[w]
+                i0 = max(0, int(np.ceil((center - support * sigmas[w] - t[0]) / dt)))
+                i1 = min(n, int((center + support * sigmas[w] - t[0]) / dt) + 1)
+                for i in range(i0, i1):
+                    x = (t[i] - center) / sigmas[w]
+                    parts[b, i - first[b]] += amps[w] * math.exp(-0.5 * x * x)
+
+        # Reduce the per-beat buffers serially
+        for b in range(len(beat_starts)):
+            for k in range(min(span, n - first[b])):
+                ecg[first[b] + k] += parts[b, k]
+
 # Define one heartbeat using a simple synthetic ECG waveform
 def synthetic_ecg(t, hr=75):
     beat_duration = 60 / hr  # duration of one heartbeat in seconds
+    beat_starts = np.arange(0, t[-1], beat_duration)
+
+    if NUMBA_AVAILABLE:
+        ecg = np.zeros_like(t)
+        _synth(ecg, t, beat_starts, wave_offsets, wave_amps, wave_sigmas, wave_support)
+        return ecg
+
+    # Time-shifted Gaussian-like waves for every (beat, wave) pair, flattened
+    centers = (beat_starts[:, None] + wave_offsets[None, :]).ravel()
+    amps = np.broadcast_to(wave_amps, (len(beat_starts), len(wave_amps))).ravel()
+    sigmas = np.broadcast_to(wave_sigmas, (len(beat_starts), len(wave_sigmas))).ravel()
+
+    # Only evaluate each wave on the samples within its support window, not the whole signal
+    dt = t[1] - t[0]
+    width = 2 * int(np.ceil(wave_support * wave_sigmas.max() / dt)) + 1
+    starts = np.searchsorted(t, centers - wave_support * sigmas)
+    idx = starts[:, None] + np.arange(width)[None, :]
+    in_range = idx < len(t)
+    idx = np.minimum(idx, len(t) - 1)
+    d = (t[idx] - centers[:, None]) / sigmas[:, None]
+    in_window = in_range & (np.abs(d) <= wave_support)
+
+    # Scatter-add the windowed waves into the output signal
+    waves = amps[:, None] * np.exp(-0.5 * d * d)
     ecg = np.zeros_like(t)
+    np.add.at(ecg, idx[in_window], waves[in_window])
 
-    for beat_start in np.arange(0, t[-1], beat_duration):
-        # Time-shifted Gaussian-like waves for P, QRS, and T components
-        p_wave = 0.25 * np.exp(-((t - (beat_start + 0.1))**2) / (2 * 0.01**2))
-        q_wave = -0.1 * np.exp(-((t - (beat_start + 0.2))**2) / (2 * 0.005**2))
-        r_wave = 1.0 * np.exp(-((t - (beat_start + 0.22))**2) / (2 * 0.01**2))
-        s_wave = -0.25 * np.exp(-((t - (beat_start + 0.24))**2) / (2 * 0.005**2))
-        t_wave = 0.5 * np.exp(-((t - (beat_start + 0.35))**2) / (2 * 0.02**2))
-        
-        ecg += p_wave + q_wave + r_wave + s_wave + t_wave
-    
     return ecg
 
 # Generate synthetic ECG
@@ -41,7 +97,7 @@ plt.legend()
 plt.show()
 
 
-df = pd.DataFrame({'Time (s)': t, 'Voltage (mV)': ecg_signal})
-df.to_csv('synthetic_ecg_60s.csv', index=False)
+np.savetxt('synthetic_ecg_60s.csv', np.column_stack([t, ecg_signal]), fmt='%.9g',
+           delimiter=',', header='Time (s),Voltage (mV)', comments='')
 
 print("ECG data saved to 'synthetic_ecg_60s.csv'")
@@ -1,9 +1,30 @@
+import os
 import numpy as np
-import pandas as pd
+
+# Try to import numexpr, but fall back to plain NumPy if not available
+try:
+    import numexpr as ne
+    ne.set_num_threads(os.cpu_count())
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+# Single-pass expression for one PQRST beat, evaluated by numexpr
+BEAT_EXPR = (
+    "0.1 * sin(2 * pi * 1 * t)"  # P-wave
+    " + -1.5 * exp(-((t - 0.3) ** 2) / 0.002)"  # Q-wave
+    " + 3.0 * exp(-((t - 0.4) ** 2) / 0.001)"  # R-wave
+    " + -0.8 * exp(-((t - 0.5) ** 2) / 0.002)"  # S-wave
+    " + where(t > 0.6, 0.3 * sin(2 * pi * 0.5 * (t - 0.6)), 0.0)"  # T-wave
+)
 
 # Function to simulate a single PQRST ECG beat
-def simulate_ecg_waveform(num_beats=5, sampling_rate=500, duration_per_beat=1.0):
+def simulate_ecg_beat(sampling_rate=500, duration_per_beat=1.0):
     t = np.linspace(0, duration_per_beat, int(sampling_rate * duration_per_beat), endpoint=False)
+    if NUMEXPR_AVAILABLE:
+        # Fused evaluation: no intermediate arrays for the individual waves
+        return t, ne.evaluate(BEAT_EXPR, local_dict={'t': t, 'pi': np.pi})
+
     ecg = (
         0.1 * np.sin(2 * np.pi * 1 * t) +  # P-wave
         -1.5 * np.exp(-((t - 0.3) ** 2) / 0.002) +  # Q-wave
@@ -11,16 +32,22 @@ def simulate_ecg_waveform(num_beats=5, sampling_rate=500, duration_per_beat=1.0)
         -0.8 * np.exp(-((t - 0.5) ** 2) / 0.002) +  # S-wave
         0.3 * np.sin(2 * np.pi * 0.5 * (t - 0.6)) * (t > 0.6)  # T-wave
     )
+    return t, ecg
 
-    # Repeat the beat for the specified number of beats
-    full_ecg = np.tile(ecg, num_beats)
-    total_time = np.linspace(0, num_beats * duration_per_beat, len(full_ecg), endpoint=False)
-
-    return pd.DataFrame({'time': total_time, 'ecg': full_ecg})
+# Write the beat train straight to CSV one beat at a time, never materializing the full signal
+def save_ecg_csv(filename, num_beats=5, sampling_rate=500, duration_per_beat=1.0):
+    t, ecg = simulate_ecg_beat(sampling_rate, duration_per_beat)
+    beat = np.column_stack([t, ecg])
 
-# Generate ECG data
-ecg_df = simulate_ecg_waveform()
+    # Timestamps come from the global sample index, so they stay clean decimals (0.004, not
+    # 0.0040000000000000001); values use the same 9 significant digits as generate.py
+    samples = np.arange(len(t))
+    with open(filename, 'w') as f:
+        f.write("time,ecg\n")
+        for i in range(num_beats):
+            beat[:, 0] = (samples + i * len(t)) * duration_per_beat / len(t)
+            np.savetxt(f, beat, delimiter=',', fmt='%.9g')
 
-# Save to CSV
-ecg_df.to_csv("simulated_pqrst_ecg.csv", index=False)
+# Generate ECG data and save to CSV
+save_ecg_csv("simulated_pqrst_ecg.csv")
 print("ECG data saved to 'simulated_pqrst_ecg.csv'")
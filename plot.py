@@ -9,17 +9,117 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
 import matplotlib.gridspec as gridspec
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
+from matplotlib.image import BboxImage
 from matplotlib.ticker import MultipleLocator
 import time
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import scipy, but provide fallback if not available
 try:
-    from scipy.signal import find_peaks, butter, filtfilt
+    from scipy.signal import find_peaks, butter, sosfiltfilt
     SCIPY_AVAILABLE = True
 except ImportError:
     SCIPY_AVAILABLE = False
 
+# Try to import numba for the compiled detection kernels; without it they run as plain NumPy code
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in decorator that leaves the function as plain Python"""
+        return lambda func: func
+
+@njit(cache=True, fastmath=True)
+def _detect_pqrst(ecg, r_idx, sampling_rate):
+    """Locate the P, Q, S and T waves around an R peak; returns their indices (-1 if not found)"""
+    n = len(ecg)
+    p_idx = q_idx = s_idx = t_idx = -1
+    
+    # P wave: highest point 200-50 ms before R
+    start = max(0, r_idx - int(0.2 * sampling_rate))
+    end = max(0, r_idx - int(0.05 * sampling_rate))
+    if start < end:
+        p_idx = start + np.argmax(ecg[start:end])
+    
+    # Q wave: small negative deflection in the 50 ms before R
+    start = max(0, r_idx - int(0.05 * sampling_rate))
+    if start < r_idx:
+        q_idx = start + np.argmin(ecg[start:r_idx])
+    
+    # S wave: negative deflection in the 50 ms after R
+    end = min(n, r_idx + int(0.05 * sampling_rate))
+    if r_idx < end:
+        s_idx = r_idx + np.argmin(ecg[r_idx:end])
+    
+    # T wave: highest point 160-300 ms after R
+    start = r_idx + int(0.16 * sampling_rate)
+    end = min(n, r_idx + int(0.3 * sampling_rate))
+    if start < end and end < n:
+        t_idx = start + np.argmax(ecg[start:end])
+    
+    return p_idx, q_idx, s_idx, t_idx
+
+class _ECGPaperGrid(BboxImage):
+    """ECG paper grid rasterized into one image filling the axes, instead of hundreds of gridlines"""
+    paper_color = '#FFECD9'
+    # (color, line width in points, alpha) for the 1 mm and 5 mm squares; major lines go on top
+    minor_style = ('#FF9999', 0.5, 0.8)
+    major_style = ('#FF0000', 1.0, 0.9)
+    
+    def __init__(self, ax):
+        super().__init__(ax.bbox, interpolation='nearest', zorder=0)
+        self._key = None
+        
+    def draw(self, renderer):
+        # Re-rasterize only when the axes size, view or tick spacing changed
+        ax = self.axes
+        width, height = int(round(ax.bbox.width)), int(round(ax.bbox.height))
+        key = (width, height, ax.get_xlim(), ax.get_ylim(),
+               ax.xaxis.get_major_locator(), ax.xaxis.get_minor_locator(),
+               ax.yaxis.get_major_locator(), ax.yaxis.get_minor_locator())
+        if key != self._key and width > 0 and height > 0:
+            self.set_data(self._rasterize(width, height))
+            self._key = key
+        super().draw(renderer)
+        
+    def _rasterize(self, width, height):
+        """Paint the grid lines at the current tick positions into an RGB pixel array"""
+        ax = self.axes
+        paper = np.array(to_rgb(self.paper_color))
+        img = np.empty((height, width, 3))
+        img[:] = paper
+        
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        for (color, linewidth, alpha), major in ((self.minor_style, False), (self.major_style, True)):
+            # Lines are blended over the paper color, at least one pixel wide; thinner
+            # lines are faded by their pixel coverage, as antialiasing would
+            pixels = linewidth * ax.figure.dpi / 72
+            alpha *= min(1.0, pixels)
+            rgb = alpha * np.array(to_rgb(color)) + (1 - alpha) * paper
+            lw = max(1, int(round(pixels)))
+            offsets = np.arange(lw) - lw // 2
+            
+            x_locator = ax.xaxis.get_major_locator() if major else ax.xaxis.get_minor_locator()
+            cols = ((np.asarray(x_locator()) - x0) / (x1 - x0) * width).astype(int)
+            cols = (cols[:, None] + offsets).ravel()
+            img[:, cols[(cols >= 0) & (cols < width)]] = rgb
+            
+            # Rows run top-down in the image
+            y_locator = ax.yaxis.get_major_locator() if major else ax.yaxis.get_minor_locator()
+            rows = height - 1 - ((np.asarray(y_locator()) - y0) / (y1 - y0) * height).astype(int)
+            rows = (rows[:, None] + offsets).ravel()
+            img[rows[(rows >= 0) & (rows < height)]] = rgb
+        
+        return img
+
 class ECGApp:
     def __init__(self, master):
         self.master = master
@@ -28,7 +128,10 @@ class ECGApp:
         self.master.configure(bg="#F0F0F0")  # Light gray background like medical devices
         
         # Add resize event binding to maintain aspect ratio
+        # (debounced: only the last of a burst of resize events relayouts the plot)
+        self._resize_job = None
         self.master.bind("<Configure>", self.on_resize)
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Set theme colors for standard medical monitor
         self.bg_color = '#F0F0F0'  # Light gray background
@@ -38,18 +141,46 @@ class ECGApp:
         
         # Data variables
         self.canvas = None
+        self.fig = None  # Figure, axes and trace line are created with the canvas in setup_plot
+        self.ax = None
+        self.line = None
         self.animation = None
         self.time_data = []
         self.ecg_data = []
         self.filtered_ecg_data = []
         self.data_file = "synthetic_ecg_60s.csv"
         self.window_size = 5  # Show 5 seconds of data at a time (typical ECG strip)
+        self.scroll_step = 1.0  # Seconds; the view scrolls in whole steps so the blit background stays valid
+        self.buffer_seconds = 10  # Ring buffer span: the longest time window the slider allows
+        self.sampling_rate = 500  # Hz, re-estimated from each loaded recording
         self.is_playing = False
         self.current_index = 0
         self.update_speed = 40  # milliseconds between updates (25 fps)
         self.data_increment = 6  # Points to add per update
+        self._after_id = None  # Pending update_plot callback
+        self._start_clock()
         self.heart_rate = 0
         
+        # Heart rate is calculated on a worker thread, at most every hr_interval seconds of data
+        self.hr_executor = ThreadPoolExecutor(max_workers=1)
+        self.hr_future = None
+        self.hr_interval = 0.5  # seconds
+        self._hr_last_index = 0
+        
+        # P/QRS/T detection likewise only reruns every components_interval seconds of data
+        self.components_interval = 1.0  # seconds
+        self._components_last_index = 0
+        
+        # CSVs larger than stream_load_bytes start playing from their first preload_rows rows
+        # while the whole file is read on a worker thread
+        self.load_executor = ThreadPoolExecutor(max_workers=1)
+        self.load_future = None
+        self.stream_load_bytes = 20 * 1024 * 1024
+        self.preload_rows = 50000
+        
+        # Last text/options applied to each status label, so unchanged updates are skipped
+        self._label_state = {}
+        
         # Standard ECG settings
         self.paper_speed = 25  # mm/sec (standard is 25mm/sec)
         self.gain = 10  # mm/mV (standard is 10mm/mV)
@@ -58,6 +189,12 @@ class ECGApp:
         self.calibration_pulse = True
         self.standard_y_min = -0.5  # mV
         self.standard_y_max = 1.5   # mV
+        self.y_min = self.standard_y_min  # Display limits, widened in load_data if the signal needs it
+        self.y_max = self.standard_y_max
+        
+        # Compile the detection kernel now so the first analysed frame doesn't stall
+        if NUMBA_AVAILABLE:
+            _detect_pqrst(np.zeros(10, dtype=np.float32), 5, 500.0)
         
         # Layout design
         self.setup_layout()
@@ -333,7 +470,7 @@ class ECGApp:
         self.status_label.pack(anchor=tk.E)
         
         self.time_display = tk.Label(status_frame, 
-                                    text="Time: 0.00s / 0.00s", 
+                                    text="Time: 0.0s / 0.00s", 
                                     font=("Arial", 10), 
                                     bg=self.bg_color, fg=self.text_color)
         self.time_display.pack(anchor=tk.E)
@@ -342,30 +479,25 @@ class ECGApp:
         """Toggle ECG grid visibility"""
         self.show_grid = self.grid_var.get()
         
-        if hasattr(self, 'ax'):
+        if self.ax is not None:
             if self.show_grid:
-                # First the minor grid (1mm x 1mm squares in pink) - 0.04s x 0.1mV
-                self.ax.grid(True, which='minor', color='#FF9999', linestyle='-', linewidth=0.5, alpha=0.8)
-                
-                # Then the major grid (5mm x 5mm squares in red) - 0.2s x 0.5mV (draw on top of minor)
-                self.ax.grid(True, which='major', color='#FF0000', linestyle='-', linewidth=1.0, alpha=0.9)
+                # Minor (1mm, pink) and major (5mm, red) squares are one pre-rendered image
+                self.paper_grid.set_visible(True)
                 
                 # Show time markers
                 if hasattr(self, 'time_markers'):
-                    for marker in self.time_markers:
-                        marker.set_visible(True)
+                    self.time_markers.set_visible(True)
                 
                 # Make the baseline (0 mV) stand out
                 if hasattr(self, 'baseline'):
                     self.baseline.set_visible(True)
             else:
                 # Hide all grid lines
-                self.ax.grid(False, which='both')
+                self.paper_grid.set_visible(False)
                 
                 # Hide time markers too
                 if hasattr(self, 'time_markers'):
-                    for marker in self.time_markers:
-                        marker.set_visible(False)
+                    self.time_markers.set_visible(False)
                 
                 # Keep only the baseline if we have it
                 if hasattr(self, 'baseline'):
@@ -379,11 +511,9 @@ class ECGApp:
         
         if hasattr(self, 'labels'):
             if not self.show_labels:
-                # Remove all wave labels
+                # Hide all wave labels
                 for wave in self.labels.values():
-                    if wave['text'] is not None:
-                        wave['text'].remove()
-                        wave['text'] = None
+                    wave['text'].set_visible(False)
                 if hasattr(self, 'interval_text'):
                     self.interval_text.set_text("")
             self.canvas.draw_idle()
@@ -417,7 +547,7 @@ class ECGApp:
             self.gain = 10  # default
         
         # Update the plot with new settings
-        if hasattr(self, 'ax'):
+        if self.ax is not None:
             # Update x-axis based on paper speed
             self.ax.xaxis.set_major_locator(MultipleLocator(0.2 * (25 / self.paper_speed)))
             self.ax.xaxis.set_minor_locator(MultipleLocator(0.04 * (25 / self.paper_speed)))
@@ -465,36 +595,231 @@ class ECGApp:
 
     def load_data(self, filename):
         try:
-            self.df = pd.read_csv(filename)
-            self.time_data = []
-            self.ecg_data = []
+            # Binary (time, ecg) arrays are memory-mapped rather than parsed; CSVs are
+            # converted once to a .npy cache next to the file and mapped on later loads
+            npy_cache = filename + '.npy'
+            columns = None
+            large = False
+            arr = None
+            if filename.endswith('.npy'):
+                arr = np.load(filename, mmap_mode='r')
+            elif os.path.exists(npy_cache) and os.path.getmtime(npy_cache) >= os.path.getmtime(filename):
+                # An unreadable cache is ignored; the CSV is parsed again and the cache rewritten
+                try:
+                    arr = np.load(npy_cache, mmap_mode='r')
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable cache file: {e}")
+            if arr is None:
+                # Use the first two columns (time, ecg) for flexibility, and parse only those
+                # with an explicit schema instead of type inference
+                columns = list(pd.read_csv(filename, nrows=0).columns[:2])
+                schema = {col: np.float64 for col in columns}
+                
+                # Large files: parse only the first rows now so playback can start right away,
+                # and read the whole file on a worker thread (swapped in by _poll_loading)
+                large = os.path.getsize(filename) > self.stream_load_bytes
+                arr = self._read_csv(filename, columns, schema, nrows=self.preload_rows if large else None)
+            
+            # Validate the recording and derive everything from it before touching the current
+            # one, so a rejected file leaves the previous recording loaded and playable
+            sampling_rate = self._estimate_sampling_rate(arr[:, 0])
+            recording = self._prepare_recording(arr, sampling_rate)
+            if columns is not None and not large:
+                self._save_cache(npy_cache, arr)
+            load_future = None
+            if large:
+                load_future = self.load_executor.submit(self._load_recording, filename, columns, schema,
+                                                        npy_cache, sampling_rate)
+            
             self.current_index = 0
+            self._hr_last_index = 0
+            self._components_last_index = 0
+            self.load_future = load_future
             
-            # Get column names for flexibility
-            time_col = self.df.columns[0]
-            ecg_col = self.df.columns[1]
+            # Discard any heart rate calculation still running on the previous recording
+            self.hr_future = None
             
-            # Get total duration for display
-            self.total_duration = self.df[time_col].iloc[-1]
+            # Size the sample buffers from the estimated sampling rate
+            self.sampling_rate = sampling_rate
+            self._alloc_buffers()
+            self._set_recording(recording)
             
             # Update time display
-            self.time_display.config(text=f"Time: 0.00s / {self.total_duration:.2f}s")
+            self._set_label(self.time_display, f"Time: 0.0s / {self.total_duration:.2f}s")
             
             # Reset plotting 
-            if hasattr(self, 'line'):
+            if self.line is not None:
                 self.setup_plot()
             
+            if load_future is not None:
+                self.master.after(100, self._poll_loading, load_future)
             return True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data file: {str(e)}")
             return False
+    
+    def _read_csv(self, filename, columns, schema, nrows=None):
+        """Parse the time and ECG columns of a CSV (or its first nrows rows) into one array"""
+        if nrows is not None:
+            df = pd.read_csv(filename, engine='c', usecols=columns, dtype=schema, nrows=nrows)
+        else:
+            # PyArrow's multi-threaded CSV reader is much faster on numeric files
+            try:
+                df = pd.read_csv(filename, engine='pyarrow', usecols=columns, dtype=schema)
+            except ImportError:
+                df = pd.read_csv(filename, engine='c', usecols=columns, dtype=schema, memory_map=True)
+        
+        return np.column_stack([df[columns[0]].to_numpy(), df[columns[1]].to_numpy()])
+    
+    def _save_cache(self, npy_cache, arr):
+        """Write a loaded recording to its .npy cache so later loads memory-map it"""
+        # Write to a temporary file in the same directory and move it into place, so a failed
+        # write never leaves a truncated cache that looks newer than the CSV
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(npy_cache)),
+                                             suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                np.save(f, arr)
+            os.replace(tmp_path, npy_cache)
+        except OSError as e:
+            print(f"Could not write cache file: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _estimate_sampling_rate(self, time_values):
+        """Sampling rate from the median sample spacing; raises ValueError if there is none"""
+        if len(time_values) < 2:
+            raise ValueError("the recording needs at least two samples")
+        
+        # Rounded so float noise in the timestamps (499.9999... for 500 Hz) doesn't shave a
+        # sample off the int(k * sampling_rate) analysis windows
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sampling_rate = round(float(1.0 / np.median(np.diff(time_values[:1000]))), 6)
+        if not np.isfinite(sampling_rate) or sampling_rate <= 0:
+            raise ValueError("could not determine the sampling rate from the time column")
+        return sampling_rate
+    
+    def _load_recording(self, filename, columns, schema, npy_cache, sampling_rate):
+        """Read, prepare and cache a whole CSV recording (runs on the load worker thread)"""
+        arr = self._read_csv(filename, columns, schema)
+        recording = self._prepare_recording(arr, sampling_rate)
+        self._save_cache(npy_cache, arr)
+        return recording
+    
+    def _poll_loading(self, future):
+        """Swap in the whole recording once its background load has finished"""
+        # Ignore loads superseded by another file
+        if future is not self.load_future:
+            return
+        if not future.done():
+            self.master.after(100, self._poll_loading, future)
+            return
+        
+        self.load_future = None
+        try:
+            recording = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load data file: {str(e)}")
+            return
+        
+        # The rows played so far are a prefix of the full array, so playback simply continues;
+        # everything was computed on the worker, so this is only a reference swap
+        self._set_recording(recording)
+        current_time = self.time_data[-1] if len(self.time_data) > 0 else 0.0
+        self._set_label(self.time_display, f"Time: {current_time:.1f}s / {self.total_duration:.2f}s")
+        if self.ax is not None:
+            self.ax.set_ylim(self.y_min, self.y_max)
+            self.canvas.draw_idle()
+    
+    def _prepare_recording(self, arr, sampling_rate):
+        """Derive the source arrays, QRS signal, y-limits and duration of a (time, ecg) array"""
+        time_arr = arr[:, 0]
+        ecg_arr = arr[:, 1]
+        
+        # Precompute the Pan-Tompkins QRS signal once for the whole recording
+        qrs_sos = pt_signal = None
+        if SCIPY_AVAILABLE:
+            try:
+                # Bandpass 5-15 Hz to keep the QRS energy and reject baseline wander and noise,
+                # designed once per recording as second-order sections for numerical stability
+                qrs_sos = butter(2, [5, 15], btype='band', fs=sampling_rate, output='sos')
+                pt_signal = self._pan_tompkins(ecg_arr, qrs_sos, sampling_rate)
+            except Exception as filter_error:
+                print(f"Error in filtering: {filter_error}")
+        
+        # Lock the y-axis per recording: the standard range, widened (with 10% padding) only if
+        # the recording goes outside it, so it never has to be rescaled frame by frame
+        ecg_min, ecg_max = ecg_arr.min(), ecg_arr.max()
+        pad = 0.1 * (ecg_max - ecg_min)
+        y_min = min(self.standard_y_min, ecg_min - pad)
+        y_max = max(self.standard_y_max, ecg_max + pad)
+        
+        # The last timestamp is the total duration for display
+        return time_arr, ecg_arr, qrs_sos, pt_signal, y_min, y_max, time_arr[-1]
+    
+    def _set_recording(self, recording):
+        """Make a _prepare_recording result the current source recording"""
+        (self.time_arr, self.ecg_arr, self.qrs_sos, self.pt_signal,
+         self.y_min, self.y_max, self.total_duration) = recording
+    
+    def _pan_tompkins(self, ecg, sos, sampling_rate):
+        """Pan-Tompkins QRS enhancement: bandpass, derivative, squaring, moving-window integration"""
+        # Zero-phase bandpass with the precomputed sections
+        filtered = sosfiltfilt(sos, ecg)
+        
+        # Emphasize the steep QRS slopes and make everything positive
+        slope = np.diff(filtered, prepend=filtered[0])
+        squared = slope * slope
+        
+        # Integrate over a 150 ms window (about one QRS width): a centered moving average
+        # taken from a running sum, O(N) instead of the O(N * window) convolution
+        window = max(1, int(0.15 * sampling_rate))
+        csum = np.concatenate(([0.0], np.cumsum(squared)))
+        ends = np.minimum(np.arange(len(squared)) + (window + 1) // 2, len(squared))
+        starts = np.maximum(np.arange(len(squared)) + (window + 1) // 2 - window, 0)
+        return ((csum[ends] - csum[starts]) / window).astype(np.float32)
+        
+    def _alloc_buffers(self):
+        """Allocate fixed-size ring buffers holding the most recent samples"""
+        self.buf_size = int(self.buffer_seconds * self.sampling_rate) + 1
+        
+        # Every sample is written twice (at head and head + buf_size) so the
+        # latest buf_size samples are always one contiguous slice. ECG values are
+        # float32 (plenty for mV readings); time stays float64 so long recordings keep
+        # sub-millisecond resolution
+        self.buf_t = np.empty(2 * self.buf_size)
+        self.buf_e = np.empty(2 * self.buf_size, dtype=np.float32)
+        self.head = 0
+        self.buf_count = 0
+        self.time_data = self.buf_t[:0]
+        self.ecg_data = self.buf_e[:0]
+        
+    def _push_samples(self, new_time, new_ecg):
+        """Append a block of samples to the ring buffers"""
+        k = min(len(new_ecg), self.buf_size)
+        new_time = new_time[len(new_time) - k:]
+        new_ecg = new_ecg[len(new_ecg) - k:]
+        # Block copies: up to the end of the buffer, then the wrapped remainder at the start
+        first = min(k, self.buf_size - self.head)
+        for buf, new in ((self.buf_t, new_time), (self.buf_e, new_ecg)):
+            for offset in (0, self.buf_size):
+                buf[offset + self.head:offset + self.head + first] = new[:first]
+                buf[offset:offset + k - first] = new[first:]
+        self.head = (self.head + k) % self.buf_size
+        self.buf_count = min(self.buf_count + k, self.buf_size)
+        
+        # Expose the buffered samples (oldest first) as views
+        end = self.head + self.buf_size
+        self.time_data = self.buf_t[end - self.buf_count:end]
+        self.ecg_data = self.buf_e[end - self.buf_count:end]
 
     def browse_file(self):
         """Allow user to select a CSV file"""
         filename = filedialog.askopenfilename(
             initialdir=os.getcwd(),
             title="Select ECG Data File",
-            filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
+            filetypes=(("CSV Files", "*.csv"), ("NumPy Files", "*.npy"), ("All Files", "*.*"))
         )
         
         if filename:
@@ -505,10 +830,26 @@ class ECGApp:
 
     def setup_plot(self):
         """Initialize the plot with standard ECG paper format"""
-        # Clear previous plot
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
+        # Build the figure once; loading another recording only resets it
+        if self.canvas is None:
+            self._build_figure()
+            return
         
+        self.line.set_data([], [])
+        self.ax.set_xlim(0, self.window_size)
+        self.ax.set_ylim(self.y_min, self.y_max)
+        
+        # Clear what was detected on the previous recording, including any heart rate
+        # calculation still running on it
+        for wave in self.labels.values():
+            wave['pos'] = None
+            wave['text'].set_visible(False)
+        self.interval_text.set_text("P-R: --- ms\nQRS: --- ms\nQ-T: --- ms")
+        self.hr_future = None
+        self.canvas.draw_idle()
+        
+    def _build_figure(self):
+        """Create the figure, ECG paper grid and artists and embed them in Tkinter"""
         # Create figure with standard ECG paper format
         # Use a fixed aspect ratio to ensure perfect squares in the grid
         self.fig = plt.figure(figsize=(10, 5), dpi=100)
@@ -523,7 +864,8 @@ class ECGApp:
         self.ax.set_facecolor('#FFECD9')  # Standardized ECG paper color
         
         # Create empty line for the ECG trace
-        self.line, = self.ax.plot([], [], color='#000000', linewidth=1.2)  # Standard black trace
+        # Animated artists are left out of the cached background and blitted on top each frame
+        self.line, = self.ax.plot([], [], color='#000000', linewidth=1.2, animated=True)  # Standard black trace
         
         # Set aspect ratio to 'equal' to ensure perfect squares
         # 1 mV (vertical) = 10 mm and 0.2 sec (horizontal) = 5 mm in standard ECG
@@ -536,11 +878,12 @@ class ECGApp:
         # 5mm squares (thick red lines) = 0.2s x 0.5mV
         
         # Configure grid visibility and style
-        # First the minor grid (1mm x 1mm squares in pink) - 0.04s x 0.1mV
-        self.ax.grid(True, which='minor', color='#FF9999', linestyle='-', linewidth=0.5, alpha=0.8)
-        
-        # Then the major grid (5mm x 5mm squares in red) - 0.2s x 0.5mV (draw on top of minor)
-        self.ax.grid(True, which='major', color='#FF0000', linestyle='-', linewidth=1.0, alpha=0.9)
+        # Minor grid (1mm x 1mm squares in pink) - 0.04s x 0.1mV, with the major grid
+        # (5mm x 5mm squares in red) - 0.2s x 0.5mV on top, rasterized into one background
+        # image so full redraws blit a single texture instead of stroking every gridline
+        self.paper_grid = _ECGPaperGrid(self.ax)
+        self.paper_grid.set_visible(self.show_grid)
+        self.ax.add_artist(self.paper_grid)
         
         # Set ticks for standard ECG paper
         # X-axis: 1 big square = 0.2s, 1 small square = 0.04s
@@ -556,8 +899,10 @@ class ECGApp:
         self.standard_y_min = -0.5  # 1 large square below baseline
         self.standard_y_max = 1.5   # 3 large squares above baseline
         
-        # Force axis limits to ensure consistent display
-        self.ax.set_ylim(self.standard_y_min, self.standard_y_max)
+        # Force axis limits to ensure consistent display (x too: the time markers don't
+        # autoscale, and tight_layout below must measure the real tick labels)
+        self.ax.set_xlim(0, self.window_size)
+        self.ax.set_ylim(self.y_min, self.y_max)
         
         # Style the plot to match clinical ECG format
         self.ax.set_title("Standard 12-Lead ECG Recording", fontsize=14, fontweight='bold')
@@ -571,10 +916,14 @@ class ECGApp:
         
         # Add time markers every second (vertical lines)
         # These are standard on many ECG recordings
-        self.time_markers = []
-        for i in range(10):
-            marker = self.ax.axvline(x=i, color='#555555', linestyle='-', linewidth=0.5, alpha=0.5)
-            self.time_markers.append(marker)
+        # One collection draws all of them; like axvline, each spans the full axes height
+        segments = np.zeros((10, 2, 2))
+        segments[:, :, 0] = np.arange(10)[:, None]
+        segments[:, 1, 1] = 1
+        self.time_markers = LineCollection(segments, colors='#555555', linestyles='-',
+                                           linewidths=0.5, alpha=0.5,
+                                           transform=self.ax.get_xaxis_transform())
+        self.ax.add_collection(self.time_markers, autolim=False)
         
         # Add standard 1mV x 100ms calibration pulse at the beginning
         # This is the standardized calibration mark in clinical ECGs
@@ -605,12 +954,29 @@ class ECGApp:
             'T': {'pos': None, 'text': None, 'color': '#00CC00'}
         }
         
+        # Each label is created once (hidden) and then only moved and shown/hidden
+        for wave_name, wave_data in self.labels.items():
+            wave_data['text'] = self.ax.annotate(
+                wave_name, 
+                (0, 0),
+                textcoords="offset points",
+                xytext=(0, 10),
+                ha='center',
+                fontsize=8,
+                fontweight='bold',
+                color=wave_data['color'],
+                backgroundcolor='white',
+                bbox=dict(boxstyle="round,pad=0.1", fc="white", alpha=0.7, ec="none"),
+                animated=True,
+                visible=False
+            )
+        
         # Standard ECG intervals text box
         self.interval_text = self.ax.text(0.02, 0.97, 
                               "P-R: --- ms\nQRS: --- ms\nQ-T: --- ms", 
                               transform=self.ax.transAxes, 
                               bbox=dict(facecolor='white', alpha=0.7, edgecolor='gray'), 
-                              fontsize=8, verticalalignment='top')
+                              fontsize=8, verticalalignment='top', animated=True)
         
         # Add lead label
         self.lead_label = self.ax.text(0.98, 0.97, "Lead II", 
@@ -626,23 +992,61 @@ class ECGApp:
         
         # Embed in Tkinter
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
         self.canvas.draw()
         widget = self.canvas.get_tk_widget()
         widget.pack(fill=tk.BOTH, expand=True)
         
-        # Add tight layout with padding
+        # Add tight layout with padding (invalidates the cached background until the next full draw)
         self.fig.tight_layout(pad=2.0)
+        self._bg = None
+        
+    def _on_draw(self, event):
+        """Cache the static background after a full redraw and paint the animated artists on it"""
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+        
+    def _draw_animated(self):
+        """Draw the artists that change every frame"""
+        self.ax.draw_artist(self.line)
+        for wave in self.labels.values():
+            self.ax.draw_artist(wave['text'])
+        self.ax.draw_artist(self.interval_text)
+        
+    def _decimate(self, x, y):
+        """Min/max decimate the trace to about two points per pixel column, preserving peaks"""
+        n_px = int(self.ax.bbox.width * (x[-1] - x[0]) / self.window_size) if len(x) > 1 else 0
+        bucket = len(y) // max(1, n_px)
+        if n_px < 1 or bucket < 2:
+            return x, y
+        
+        # Keep the min and max sample of every bucket, in time order, plus the unbucketed tail
+        n_full = (len(y) // bucket) * bucket
+        blocks = y[:n_full].reshape(-1, bucket)
+        extremes = np.sort(np.stack([blocks.argmin(axis=1), blocks.argmax(axis=1)], axis=1), axis=1)
+        idx = (extremes + np.arange(0, n_full, bucket)[:, None]).ravel()
+        idx = np.concatenate([idx, np.arange(n_full, len(y))])
+        return x[idx], y[idx]
+        
+    def _window_limits(self, current_time):
+        """X-axis limits for the visible window, advanced in whole scroll steps"""
+        end_time = max(self.window_size, np.ceil(current_time / self.scroll_step) * self.scroll_step)
+        return (end_time - self.window_size, end_time)
         
     def update_plot(self):
         """Update the plot with new data points using standard ECG format"""
-        if not self.is_playing or self.current_index >= len(self.df):
+        if not self.is_playing or self.current_index >= len(self.ecg_arr):
+            # Playback caught up with a file still loading in the background: wait for it
+            if self.is_playing and self.load_future is not None:
+                self._schedule_next_frame()
             return
         
-        # Add new data points
-        for _ in range(min(self.data_increment, len(self.df) - self.current_index)):
-            self.time_data.append(self.df.iloc[self.current_index, 0])
-            self.ecg_data.append(self.df.iloc[self.current_index, 1])
-            self.current_index += 1
+        # Add new data points, including those of any frames skipped while running late
+        k = min(self.data_increment * (1 + self._frames_behind), len(self.ecg_arr) - self.current_index)
+        self._frames_behind = 0
+        self._push_samples(self.time_arr[self.current_index:self.current_index + k],
+                          self.ecg_arr[self.current_index:self.current_index + k])
+        self.current_index += k
         
         # If we have enough data, calculate heart rate and detect ECG components
         if len(self.ecg_data) > 100:
@@ -653,24 +1057,25 @@ class ECGApp:
         if len(self.time_data) > 0:
             # Determine the visible time window (standard ECG strips are typically 10 seconds)
             current_time = self.time_data[-1]
-            start_time = max(0, current_time - self.window_size)
+            start_time, end_time = self._window_limits(current_time)
             
-            # Get the visible data window
-            visible_indices = [i for i, t in enumerate(self.time_data) if start_time <= t <= current_time]
+            # Get the visible data window (time is monotonic, so a binary search finds its start)
+            start_idx = np.searchsorted(self.time_data, start_time, side='left')
+            visible_time = self.time_data[start_idx:]
+            visible_ecg = self.ecg_data[start_idx:]
             
-            if visible_indices:
-                visible_time = [self.time_data[i] for i in visible_indices]
-                visible_ecg = [self.ecg_data[i] for i in visible_indices]
+            if len(visible_time) > 0:
                 
-                # Update the line data
-                self.line.set_data(visible_time, visible_ecg)
+                # Update the line data (decimated to the display resolution)
+                self.line.set_data(*self._decimate(visible_time, visible_ecg))
                 
-                # Adjust the plot x-axis limits
-                self.ax.set_xlim(start_time, current_time)
+                # Adjust the plot x-axis limits (only when the view scrolls)
+                scrolled = self.ax.get_xlim() != (start_time, end_time)
+                if scrolled:
+                    self.ax.set_xlim(start_time, end_time)
                 
-                # Use fixed, standardized y-axis limits for ECG display
-                # Standard is typically ±1.5mV from baseline
-                self.ax.set_ylim(self.standard_y_min, self.standard_y_max)
+                # The y-axis limits were fixed in load_data (standard ±1.5mV from baseline
+                # unless the recording needs more), so they are not touched per frame
                 
                 # Scale the display to standard 25mm/s paper speed (where 1mm = 0.04s)
                 # and 10mm/mV amplitude (where 1mm = 0.1mV)
@@ -679,15 +1084,21 @@ class ECGApp:
                 # Update the wave segment annotations if available
                 self.update_waveform_annotations(visible_time, visible_ecg)
                 
-                # Update the time display
-                self.time_display.config(text=f"Time: {current_time:.2f}s / {self.total_duration:.2f}s")
+                # Update the time display (tenths of a second, so most frames leave it unchanged)
+                self._set_label(self.time_display, f"Time: {current_time:.1f}s / {self.total_duration:.2f}s")
                 
-                # Draw the plot
-                self.canvas.draw_idle()  # This is faster than full redraw
+                # Draw the plot: full redraw when the view scrolled, otherwise blit
+                # the animated artists over the cached background
+                if scrolled or self._bg is None:
+                    self.canvas.draw()
+                else:
+                    self.canvas.restore_region(self._bg)
+                    self._draw_animated()
+                    self.canvas.blit(self.ax.bbox)
         
         # Schedule next update
-        if self.current_index < len(self.df):
-            self.master.after(self.update_speed, self.update_plot)
+        if self.current_index < len(self.ecg_arr) or self.load_future is not None:
+            self._schedule_next_frame()
         else:
             self.is_playing = False
             self.play_btn.config(text="▶ Play")
@@ -696,23 +1107,25 @@ class ECGApp:
         """Detect P, QRS, T waves and their intervals"""
         if len(self.ecg_data) < 200:  # Need enough data
             return
+        
+        # The waves only change once per beat, so skip until enough new data has arrived
+        if self.current_index - self._components_last_index < self.components_interval * self.sampling_rate:
+            return
+        self._components_last_index = self.current_index
             
         # Get the most recent cardiac cycle
         data_window = 2  # seconds of data to analyze
-        sampling_rate = 500  # estimated sampling rate
+        sampling_rate = self.sampling_rate  # estimated from the recording in load_data
         
-        # Use the last segment of data to find a complete cycle
-        if len(self.ecg_data) > data_window * sampling_rate:
-            recent_time = self.time_data[-int(data_window * sampling_rate):]
-            recent_data = self.ecg_data[-int(data_window * sampling_rate):]
-        else:
-            recent_time = self.time_data
-            recent_data = self.ecg_data
+        # Use the last segment of data to find a complete cycle (zero-copy views of the ring buffer)
+        window_samples = int(data_window * sampling_rate)
+        recent_time = self.time_data[-window_samples:]
+        recent_data = self.ecg_data[-window_samples:]
             
         # Find R peaks (main spike of QRS complex)
         if SCIPY_AVAILABLE:
             # Use scipy's find_peaks
-            peaks, _ = find_peaks(recent_data, height=0.5, distance=sampling_rate*0.4)
+            peaks, _ = find_peaks(recent_data, height=0.5, distance=max(1, int(sampling_rate * 0.4)))
             
             if len(peaks) >= 2:
                 # We need at least 2 R peaks to define a complete cycle
@@ -726,41 +1139,11 @@ class ECGApp:
                 # Calculate cycle length
                 cycle_len = peaks[1] - peaks[0]
                 
-                # Look for P wave (typically 120-200ms before R)
-                p_search_start = max(0, peak1_idx - int(0.2 * sampling_rate))
-                p_search_end = max(0, peak1_idx - int(0.05 * sampling_rate))
-                if p_search_start < p_search_end:
-                    p_segment = recent_data[p_search_start:p_search_end]
-                    if len(p_segment) > 0:
-                        p_idx = p_search_start + np.argmax(p_segment)
-                        self.labels['P']['pos'] = (recent_time[p_idx], recent_data[p_idx])
-                
-                # Look for Q wave (small negative deflection before R)
-                q_search_start = max(0, peak1_idx - int(0.05 * sampling_rate))
-                q_search_end = peak1_idx
-                if q_search_start < q_search_end:
-                    q_segment = recent_data[q_search_start:q_search_end]
-                    if len(q_segment) > 0:
-                        q_idx = q_search_start + np.argmin(q_segment)
-                        self.labels['Q']['pos'] = (recent_time[q_idx], recent_data[q_idx])
-                
-                # Look for S wave (negative deflection after R)
-                s_search_start = peak1_idx
-                s_search_end = min(len(recent_data), peak1_idx + int(0.05 * sampling_rate))
-                if s_search_start < s_search_end:
-                    s_segment = recent_data[s_search_start:s_search_end]
-                    if len(s_segment) > 0:
-                        s_idx = s_search_start + np.argmin(s_segment)
-                        self.labels['S']['pos'] = (recent_time[s_idx], recent_data[s_idx])
-                
-                # Look for T wave (typically 160-300ms after R peak)
-                t_search_start = peak1_idx + int(0.16 * sampling_rate)
-                t_search_end = min(len(recent_data), peak1_idx + int(0.3 * sampling_rate))
-                if t_search_start < t_search_end and t_search_end < len(recent_data):
-                    t_segment = recent_data[t_search_start:t_search_end]
-                    if len(t_segment) > 0:
-                        t_idx = t_search_start + np.argmax(t_segment)
-                        self.labels['T']['pos'] = (recent_time[t_idx], recent_data[t_idx])
+                # Look for the P, Q, S and T waves around the first R peak
+                wave_idx = _detect_pqrst(recent_data, peak1_idx, sampling_rate)
+                for wave_name, idx in zip('PQST', wave_idx):
+                    if idx >= 0:
+                        self.labels[wave_name]['pos'] = (recent_time[idx], recent_data[idx])
                     
                 # Calculate intervals if we have the necessary components
                 intervals_text = []
@@ -791,58 +1174,74 @@ class ECGApp:
         
     def update_waveform_annotations(self, visible_time, visible_ecg):
         """Update the annotations for ECG waveform components if they're in view"""
-        # Remove existing annotations
-        for wave in self.labels.values():
-            if wave['text'] is not None:
-                wave['text'].remove()
-                wave['text'] = None
-        
-        # Check which components are in the current view
-        current_time_min = min(visible_time)
-        current_time_max = max(visible_time)
-        
-        for wave_name, wave_data in self.labels.items():
-            if wave_data['pos'] is not None:
-                wave_time, wave_val = wave_data['pos']
-                
-                if current_time_min <= wave_time <= current_time_max:
-                    # Add annotation for the wave component
-                    wave_data['text'] = self.ax.annotate(
-                        wave_name, 
-                        (wave_time, wave_val),
-                        textcoords="offset points",
-                        xytext=(0, 10),
-                        ha='center',
-                        fontsize=8,
-                        fontweight='bold',
-                        color=wave_data['color'],
-                        backgroundcolor='white',
-                        bbox=dict(boxstyle="round,pad=0.1", fc="white", alpha=0.7, ec="none")
-                    )
+        # Check which components are in the current view (time is monotonic, so the
+        # window's ends are its first and last samples)
+        current_time_min = visible_time[0]
+        current_time_max = visible_time[-1]
+        
+        for wave_data in self.labels.values():
+            in_view = bool(self.show_labels and wave_data['pos'] is not None
+                           and current_time_min <= wave_data['pos'][0] <= current_time_max)
+            
+            # Move the existing annotation onto the wave component rather than recreating it
+            if in_view:
+                wave_data['text'].xy = wave_data['pos']
+            wave_data['text'].set_visible(in_view)
 
     def calculate_heart_rate(self):
-        """Calculate and display heart rate from the ECG data using clinical standards"""
+        """Schedule heart rate calculation in the background and show finished results"""
+        # Pick up a finished calculation from the worker thread (Tk widgets are only touched here)
+        if self.hr_future is not None and self.hr_future.done():
+            self._show_heart_rate(self.hr_future.result())
+            self.hr_future = None
+        
+        # Only recalculate once enough new data has arrived, and never with a calculation pending
+        if self.hr_future is not None or self.current_index - self._hr_last_index < self.hr_interval * self.sampling_rate:
+            return
+        self._hr_last_index = self.current_index
+        
+        # Use the last 10 seconds of data for calculation (standard approach for clinical ECG)
+        window_size = 10  # seconds
+        sampling_rate = self.sampling_rate  # Estimated from the recording in load_data
+        
+        # Take the last section from the loaded arrays rather than the ring buffer,
+        # which keeps changing while the worker runs
+        end = self.current_index
+        start = max(0, end - int(window_size * sampling_rate))
+        recent_data = self.ecg_arr[start:end]
+        recent_time = self.time_arr[start:end]
+        pt_window = self.pt_signal[start:end] if self.pt_signal is not None else None
+        
+        self.hr_future = self.hr_executor.submit(self._compute_heart_rate, recent_data, recent_time,
+                                                 sampling_rate, pt_window)
+    
+    def _show_heart_rate(self, result):
+        """Update the HR and status displays with a (hr_text, status_text, status_color, heart_rate) result"""
+        if result is None:
+            return
+        hr_text, status_text, status_color, heart_rate = result
+        if heart_rate is not None:
+            self.heart_rate = heart_rate
+        self._set_label(self.hr_display, hr_text)
+        self._set_label(self.status_label, status_text, fg=status_color)
+    
+    def _set_label(self, label, text, **options):
+        """Reconfigure a Tk label only if its text or options differ from what it shows"""
+        state = (text, options)
+        if self._label_state.get(label) != state:
+            label.config(text=text, **options)
+            self._label_state[label] = state
+    
+    def _compute_heart_rate(self, recent_data, recent_time, sampling_rate, pt_window=None):
+        """Calculate heart rate from the ECG data using clinical standards (runs on the worker thread)"""
         try:
-            # Use the last 10 seconds of data for calculation (standard approach for clinical ECG)
-            window_size = 10  # seconds
-            sampling_rate = 500  # Estimate from data density
-            
-            # Get the last section of data
-            recent_data = self.ecg_data[-int(min(window_size * sampling_rate, len(self.ecg_data))):]
-            recent_time = self.time_data[-int(min(window_size * sampling_rate, len(self.time_data))):]
-            
             if len(recent_data) < 100:  # Need enough data
-                return
+                return None
             
-            # Optional: Apply bandpass filter to clean the signal for better peak detection
-            if SCIPY_AVAILABLE:
+            # Use the precomputed Pan-Tompkins signal (see load_data) for robust peak detection
+            if SCIPY_AVAILABLE and pt_window is not None:
                 try:
-                    # Apply bandpass filter (5-20 Hz typically used for QRS detection)
-                    nyquist = 0.5 * sampling_rate
-                    low = 5 / nyquist
-                    high = 20 / nyquist
-                    b, a = butter(2, [low, high], btype='band')
-                    filtered_data = filtfilt(b, a, recent_data)
+                    filtered_data = pt_window
                     
                     # Find R peaks (QRS complexes)
                     # Height is adaptive based on signal characteristics
@@ -856,100 +1255,118 @@ class ECGApp:
                     
                     if len(peaks) > 1:
                         # Calculate RR intervals in seconds
-                        rr_intervals = np.diff([recent_time[i] for i in peaks])
+                        rr_intervals = np.diff(recent_time[peaks])
                         
                         # Filter out unrealistic intervals (clinical approach)
-                        valid_intervals = [rr for rr in rr_intervals if 0.3 <= rr <= 2.0]  # 30-200 BPM range
+                        valid_intervals = rr_intervals[(rr_intervals >= 0.3) & (rr_intervals <= 2.0)]  # 30-200 BPM range
                         
                         if len(valid_intervals) > 0:
                             # Calculate heart rate using the average RR interval
                             avg_rr = np.mean(valid_intervals)
-                            self.heart_rate = int(60 / avg_rr)
+                            heart_rate = int(60 / avg_rr)
                             
                             # Clinical quality check - ensure HR is in reasonable range
-                            if 30 <= self.heart_rate <= 200:
-                                # Update the display with calculated HR
-                                self.hr_display.config(text=f"{self.heart_rate}")
-                                
-                                # Update status based on HR ranges
-                                if self.heart_rate < 60:
-                                    self.status_label.config(text="Status: Bradycardia", fg="#FF6600")
-                                elif self.heart_rate > 100:
-                                    self.status_label.config(text="Status: Tachycardia", fg="#FF0000")
+                            if 30 <= heart_rate <= 200:
+                                # Status based on HR ranges
+                                if heart_rate < 60:
+                                    return (f"{heart_rate}", "Status: Bradycardia", "#FF6600", heart_rate)
+                                elif heart_rate > 100:
+                                    return (f"{heart_rate}", "Status: Tachycardia", "#FF0000", heart_rate)
                                 else:
-                                    self.status_label.config(text="Status: Normal Sinus Rhythm", fg="#009900")
+                                    return (f"{heart_rate}", "Status: Normal Sinus Rhythm", "#009900", heart_rate)
                             else:
-                                self.hr_display.config(text="--")
-                                self.status_label.config(text="Status: Invalid HR Reading", fg="#FF0000")
+                                return ("--", "Status: Invalid HR Reading", "#FF0000", heart_rate)
                         else:
-                            self.hr_display.config(text="--")
-                            self.status_label.config(text="Status: Calculating...", fg="#666666")
+                            return ("--", "Status: Calculating...", "#666666", None)
                     else:
-                        self.hr_display.config(text="--")
-                        self.status_label.config(text="Status: Insufficient Data", fg="#666666")
+                        return ("--", "Status: Insufficient Data", "#666666", None)
                         
                 except Exception as filter_error:
                     print(f"Error in filtering: {filter_error}")
                     # Fall back to simple calculation
-                    self._simple_hr_calculation(recent_data, sampling_rate)
+                    return self._simple_hr_calculation(recent_data, sampling_rate)
             else:
                 # Simple fallback method if scipy is not available
-                self._simple_hr_calculation(recent_data, sampling_rate)
+                return self._simple_hr_calculation(recent_data, sampling_rate)
                 
         except Exception as e:
             print(f"Error calculating heart rate: {e}")
-            self.hr_display.config(text="--")
-            self.status_label.config(text="Status: Error", fg="#FF0000")
+            return ("--", "Status: Error", "#FF0000", None)
     
     def _simple_hr_calculation(self, recent_data, sampling_rate):
         """Basic heart rate calculation as fallback"""
         try:
             # Use basic threshold detection
+            recent_data = np.asarray(recent_data)
             threshold = np.mean(recent_data) + 1.5 * np.std(recent_data)
-            above_threshold = np.where(np.array(recent_data) > threshold)[0]
+            above_threshold = recent_data > threshold
+            
+            # Find runs of consecutive points above the threshold (start/end edges of each run)
+            edges = np.flatnonzero(np.diff(np.r_[0, above_threshold.view(np.int8), 0]))
+            starts, ends = edges[::2], edges[1::2]
             
-            # Find sequences of consecutive points (peaks)
-            peaks = []
-            if len(above_threshold) > 0:
-                # Group consecutive indices
-                groups = np.split(above_threshold, np.where(np.diff(above_threshold) != 1)[0] + 1)
+            peaks = np.empty(0, dtype=int)
+            if len(starts) > 0:
+                # Get the max value index in each run as the peak (first index reaching the run maximum)
+                run_max = np.maximum.reduceat(recent_data, starts)
+                run_idx = np.flatnonzero(above_threshold)
+                run_id = np.repeat(np.arange(len(starts)), ends - starts)
+                at_max = recent_data[run_idx] == run_max[run_id]
+                candidates, candidate_runs = run_idx[at_max], run_id[at_max]
+                peaks = candidates[np.r_[True, np.diff(candidate_runs) != 0]]
                 
-                # Get the max value index in each group as the peak
-                for group in groups:
-                    if len(group) > 0:
-                        peak_idx = group[np.argmax([recent_data[i] for i in group])]
-                        # Add minimum distance check
-                        if not peaks or (peak_idx - peaks[-1]) > sampling_rate * 0.4:
-                            peaks.append(peak_idx)
+                # Add minimum distance check: jump straight to the first candidate far enough
+                # after the last accepted peak (one step per accepted peak, not per sample)
+                accepted = [0]
+                while True:
+                    nxt = np.searchsorted(peaks, peaks[accepted[-1]] + sampling_rate * 0.4, side='right')
+                    if nxt >= len(peaks):
+                        break
+                    accepted.append(nxt)
+                peaks = peaks[accepted]
             
             if len(peaks) > 1:
                 # Calculate average interval between peaks
                 avg_interval = np.mean(np.diff(peaks)) / sampling_rate  # in seconds
-                self.heart_rate = int(60 / avg_interval)
+                heart_rate = int(60 / avg_interval)
                 
                 # Clinical quality check
-                if 30 <= self.heart_rate <= 200:
-                    # Update the display
-                    self.hr_display.config(text=f"{self.heart_rate}")
-                    
-                    # Update status based on HR ranges
-                    if self.heart_rate < 60:
-                        self.status_label.config(text="Status: Bradycardia", fg="#FF6600")
-                    elif self.heart_rate > 100:
-                        self.status_label.config(text="Status: Tachycardia", fg="#FF0000")
+                if 30 <= heart_rate <= 200:
+                    # Status based on HR ranges
+                    if heart_rate < 60:
+                        return (f"{heart_rate}", "Status: Bradycardia", "#FF6600", heart_rate)
+                    elif heart_rate > 100:
+                        return (f"{heart_rate}", "Status: Tachycardia", "#FF0000", heart_rate)
                     else:
-                        self.status_label.config(text="Status: Normal Rhythm", fg="#009900")
+                        return (f"{heart_rate}", "Status: Normal Rhythm", "#009900", heart_rate)
                 else:
-                    self.hr_display.config(text="--")
-                    self.status_label.config(text="Status: Invalid Reading", fg="#FF0000")
+                    return ("--", "Status: Invalid Reading", "#FF0000", heart_rate)
             else:
-                self.hr_display.config(text="--")
-                self.status_label.config(text="Status: Calculating...", fg="#666666")
+                return ("--", "Status: Calculating...", "#666666", None)
                 
         except Exception as e:
             print(f"Simple HR calculation error: {e}")
-            self.hr_display.config(text="--")
-            self.status_label.config(text="Status: Error", fg="#FF0000")
+            return ("--", "Status: Error", "#FF0000", None)
+    
+    def _start_clock(self):
+        """Anchor the playback frame clock at the current time"""
+        self._clock_t0 = time.perf_counter()
+        self._frame_n = 0
+        self._frames_behind = 0
+    
+    def _schedule_next_frame(self):
+        """Schedule the next update on a fixed wall-clock frame grid, so callback time doesn't add drift"""
+        self._frame_n += 1
+        delay = self._clock_t0 + self._frame_n * self.update_speed / 1000 - time.perf_counter()
+        
+        # More than a frame behind: skip ahead instead of firing a burst of catch-up frames;
+        # the next frame takes the skipped frames' samples in one batch to keep the set speed
+        if delay < -self.update_speed / 1000:
+            frames_behind = int(-delay * 1000 / self.update_speed)
+            self._start_clock()
+            self._frames_behind = frames_behind
+            delay = 0
+        self._after_id = self.master.after(int(max(0, delay) * 1000), self.update_plot)
     
     def toggle_playback(self):
         if self.is_playing:
@@ -960,9 +1377,14 @@ class ECGApp:
             self.play_btn.config(text="⏸ Pause")
             
             # If at the end, restart
-            if self.current_index >= len(self.df):
+            if self.current_index >= len(self.ecg_arr) and self.load_future is None:
                 self.reset_simulation()
             
+            # Drop any callback left over from before a pause so only one update loop runs
+            if self._after_id is not None:
+                self.master.after_cancel(self._after_id)
+                self._after_id = None
+            self._start_clock()
             self.update_plot()
     
     def reset_simulation(self):
@@ -973,36 +1395,38 @@ class ECGApp:
         
         # Reset data
         self.current_index = 0
-        self.time_data = []
-        self.ecg_data = []
+        self._alloc_buffers()
         self.filtered_ecg_data = []
         
+        # Discard any heart rate calculation still running on the old data
+        self.hr_future = None
+        self._hr_last_index = 0
+        self._components_last_index = 0
+        
         # Reset displays
-        self.time_display.config(text=f"Time: 0.00s / {self.total_duration:.2f}s")
-        self.hr_display.config(text="--")
-        self.status_label.config(text="Status: Ready", fg="#003366")
+        self._set_label(self.time_display, f"Time: 0.0s / {self.total_duration:.2f}s")
+        self._set_label(self.hr_display, "--")
+        self._set_label(self.status_label, "Status: Ready", fg="#003366")
         
         # Reset annotations
         if hasattr(self, 'labels'):
             for wave in self.labels.values():
                 wave['pos'] = None
-                if wave['text'] is not None:
-                    wave['text'].remove()
-                    wave['text'] = None
+                wave['text'].set_visible(False)
             
             # Reset interval text
             if hasattr(self, 'interval_text'):
                 self.interval_text.set_text("P-R: --- ms\nQRS: --- ms\nQ-T: --- ms")
         
         # Reset the plot line
-        if hasattr(self, 'line'):
+        if self.line is not None:
             self.line.set_data([], [])
             
             # Make sure axes are set to standard clinical values
-            if hasattr(self, 'ax'):
+            if self.ax is not None:
                 # Reset to standard 10-second view
                 self.ax.set_xlim(0, self.window_size)
-                self.ax.set_ylim(self.standard_y_min, self.standard_y_max)
+                self.ax.set_ylim(self.y_min, self.y_max)
                 
                 # Make sure calibration is visible if enabled
                 if hasattr(self, 'cal_rect'):
@@ -1017,6 +1441,7 @@ class ECGApp:
             # Convert to a reasonable speed range (20ms to 200ms)
             self.update_speed = int(200 / speed_factor)
             self.data_increment = max(1, int(speed_factor))
+            self._start_clock()
             
             # Update the label if it exists
             if hasattr(self, 'speed_value_label'):
@@ -1034,11 +1459,9 @@ class ECGApp:
                 self.window_value_label.config(text=f"{self.window_size:.1f} sec")
             
             # If we have data, update the plot
-            if hasattr(self, 'line') and hasattr(self, 'ax') and len(self.time_data) > 0:
+            if self.line is not None and len(self.time_data) > 0:
                 # Update the plot with new window size
-                current_time = self.time_data[-1]
-                start_time = max(0, current_time - self.window_size)
-                self.ax.set_xlim(start_time, current_time)
+                self.ax.set_xlim(*self._window_limits(self.time_data[-1]))
                 self.canvas.draw_idle()
         except Exception as e:
             print(f"Error updating window size: {e}")
@@ -1046,26 +1469,35 @@ class ECGApp:
     def on_resize(self, event):
         """Handle window resize events to maintain proper grid aspect ratio"""
         # Only process if the event is for the main window and we have an active plot
-        if event.widget == self.master and hasattr(self, 'fig') and hasattr(self, 'ax'):
-            # Give the UI a moment to settle with the new size
-            self.master.after(200, self._update_plot_after_resize)
+        if event.widget == self.master and self.ax is not None:
+            # Give the UI a moment to settle with the new size, restarting the wait on
+            # every event so a window drag triggers one relayout instead of hundreds
+            if self._resize_job is not None:
+                self.master.after_cancel(self._resize_job)
+            self._resize_job = self.master.after(200, self._update_plot_after_resize)
+
+    def on_close(self):
+        """Stop the background workers and close the window"""
+        # Drop queued work and don't wait for running work
+        self.hr_executor.shutdown(wait=False, cancel_futures=True)
+        self.load_executor.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
 
     def _update_plot_after_resize(self):
         """Update the plot after a window resize to maintain proper grid appearance"""
-        if hasattr(self, 'fig') and hasattr(self, 'ax'):
+        self._resize_job = None
+        if self.ax is not None:
             # Recalculate the aspect ratio based on the current speed and gain settings
             new_aspect = (0.2 * (25 / self.paper_speed)) / (0.5 * (10 / self.gain))
             self.ax.set_aspect(new_aspect)
             
             # Make sure axis limits are maintained
             if len(self.time_data) > 0:
-                current_time = self.time_data[-1]
-                start_time = max(0, current_time - self.window_size)
-                self.ax.set_xlim(start_time, current_time)
+                self.ax.set_xlim(*self._window_limits(self.time_data[-1]))
             else:
                 self.ax.set_xlim(0, self.window_size)
                 
-            self.ax.set_ylim(self.standard_y_min, self.standard_y_max)
+            self.ax.set_ylim(self.y_min, self.y_max)
             
             # Update the canvas
             self.fig.tight_layout(pad=2.0)